@@ -10,255 +10,372 @@ This script validates all JSON configuration files for:
 - AI budget alignment with show durations
 """
 
+import argparse
+import bisect
+import functools
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; the stdlib parser is fine for CI
+    _json = json
 
-def load_json(filepath):
-    """Load and parse a JSON file."""
+BASE_CONFIG_FILES = [
+    'config/station.json',
+    'config/presenters.json',
+    'config/tags.json',
+]
+
+# Set from --verbose; per-file and per-show detail lines are only
+# formatted and printed when this is on
+VERBOSE = False
+
+# Minutes past midnight for every valid "HH:MM" time, so parsing a
+# schedule time is a single lookup
+HM_TO_MIN = {f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)}
+
+# End times that mean a show runs until midnight. "24:00" is accepted
+# alongside "00:00" as it was before the lookup table was introduced;
+# it is not a valid start time.
+MIDNIGHT_END_TIMES = ("00:00", "24:00")
+
+# Message templates for the per-show and per-boundary checks; they are
+# only formatted when a check fails
+ERR_UNKNOWN_PRESENTER = "{show_id}: Unknown presenter '{presenter_id}'"
+ERR_UNKNOWN_TAG = "{show_id}: Unknown tag '{tag}'"
+ERR_MUSIC_ABOVE_MAX = "{show_id}: Music {music_fraction} exceeds maximum {max_music}"
+ERR_TALK_BELOW_MIN = "{show_id}: Talk {talk_fraction} below minimum {min_talk}"
+ERR_RATIO_SUM = "{show_id}: Ratios sum to {total}, not 1.0"
+ERR_INVALID_TIME = "{show_id}: Invalid {which} time '{value}'"
+ERR_SCHEDULE_GAP = "Gap of {minutes} minutes between {current} and {next_show}"
+ERR_SCHEDULE_OVERLAP = "Overlap of {minutes} minutes between {current} and {next_show}"
+WARN_TTS_BUDGET = "{show_id}: TTS budget {tts_budget}s differs from expected {expected_tts:.0f}s"
+WARN_MUSIC_BUDGET = "{show_id}: Music budget {music_budget}min differs from expected {expected_music_mins:.0f}min"
+
+# Tolerances for the per-show ratio and AI budget checks
+RATIO_SUM_TOLERANCE = 0.001
+TTS_BUDGET_TOLERANCE_SECONDS = 60
+MUSIC_BUDGET_TOLERANCE_MINUTES = 5
+
+
+@functools.lru_cache(maxsize=None)
+def read_json(filepath):
+    """Read and parse a JSON file, returning a (data, error) pair.
+
+    Results are cached by path string so each file is read and parsed
+    once, however many validators ask for it.
+    """
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"✗ {filepath} - JSON parsing error: {e}")
-        return None
+        with open(filepath, 'rb') as f:
+            return _json.loads(f.read()), None
+    except _json.JSONDecodeError as e:
+        return None, f"JSON parsing error: {e}"
     except FileNotFoundError:
-        print(f"✗ {filepath} - File not found")
+        return None, "File not found"
+
+
+def load_json(filepath):
+    """Load and parse a JSON file, returning None if it is unreadable."""
+    return read_json(filepath)[0]
+
+
+def preload_json(filepaths):
+    """Read and parse all files concurrently to warm the read_json cache."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(read_json, filepaths))
+
+
+@functools.cache
+def load_presenter_ids():
+    """Return the known presenter IDs, or None if presenters.json is unreadable."""
+    presenters_data = load_json('config/presenters.json')
+    if not presenters_data:
         return None
+    return frozenset({p['id'] for p in presenters_data['presenters']})
 
 
-def validate_json_syntax():
-    """Validate JSON syntax for all configuration files."""
+@functools.cache
+def load_allowed_tags():
+    """Return the allowed topic tags, or None if tags.json is unreadable."""
+    tags_data = load_json('config/tags.json')
+    if not tags_data:
+        return None
+    return frozenset(tags_data['allowed_topic_tags'])
+
+
+def format_minutes(minutes):
+    """Format minutes past midnight as "HH:MM"."""
+    hours, mins = divmod(minutes, 60)
+    return f"{hours:02d}:{mins:02d}"
+
+
+def validate_json_syntax(show_files):
+    """Validate JSON syntax for all configuration files.
+
+    Returns (errors, parsed) where parsed maps the path of every file
+    that loaded as a non-empty JSON object to its data, so later checks
+    can skip the files already reported here.
+    """
     print("=== JSON Syntax Validation ===")
-    files = [
-        'config/station.json',
-        'config/presenters.json',
-        'config/tags.json',
-    ] + list(Path('config/shows').glob('*.json'))
+    files = BASE_CONFIG_FILES + show_files
     
     errors = []
+    parsed = {}
     for filepath in files:
-        if load_json(filepath) is None:
+        data, error = read_json(filepath)
+        if error:
+            print(f"✗ {filepath} - {error}")
             errors.append(f"Invalid JSON: {filepath}")
-        else:
+            continue
+        
+        # Valid JSON that is null, empty or not an object cannot be checked
+        # further; null is also reported as invalid, as it always has been
+        if not isinstance(data, dict) or not data:
+            print(f"✗ {filepath} - Expected a non-empty JSON object")
+            if data is None:
+                errors.append(f"Invalid JSON: {filepath}")
+            errors.append(f"Failed to load {filepath}")
+            continue
+        
+        parsed[filepath] = data
+        if VERBOSE:
             print(f"✓ {filepath}")
     
-    return errors
+    if not errors:
+        print(f"✓ All {len(files)} files are valid JSON")
+    
+    return errors, parsed
+
+
+def validate_show(show, presenter_ids, allowed_tags, max_music, min_talk):
+    """Run every per-show check in a single pass over one show config.
 
+    Cross-reference checks are skipped when presenter_ids or allowed_tags
+    is None, and ratio checks when max_music or min_talk is None, so one
+    unreadable base file does not hide the other checks.
 
-def validate_cross_references():
-    """Validate cross-references between configuration files."""
-    print("\n=== Cross-Reference Validation ===")
+    Returns (errors, warnings, schedule_entry). The schedule entry is
+    collected by the caller for the coverage check, which needs all
+    shows at once; it is None when a schedule time is not valid HH:MM.
+    """
     errors = []
+    warnings = []
     
-    # Load configuration files
-    presenters_data = load_json('config/presenters.json')
-    tags_data = load_json('config/tags.json')
-    
-    if not presenters_data or not tags_data:
-        return ["Failed to load base configuration files"]
-    
-    # Get presenter IDs and allowed tags
-    presenter_ids = set(p['id'] for p in presenters_data['presenters'])
-    allowed_tags = set(tags_data['allowed_topic_tags'])
-    
-    print(f"Found {len(presenter_ids)} presenters")
-    print(f"Found {len(allowed_tags)} allowed topic tags")
+    show_id = show['id']
+    schedule = show['schedule']
+    ratios = show['ratios']
+    budget = show['ai_budget']
     
-    # Check each show
-    show_files = sorted(Path('config/shows').glob('*.json'))
-    for show_file in show_files:
-        show = load_json(show_file)
-        if not show:
-            errors.append(f"Failed to load {show_file}")
-            continue
-        
-        show_id = show['id']
-        
-        # Validate presenter references
+    if presenter_ids is not None and allowed_tags is not None:
+        # Validate presenter references; the subset test runs in C and only
+        # a failing show pays for the per-presenter scan
         duo = show['presenters']['primary_duo']
-        for presenter_id in duo:
-            if presenter_id not in presenter_ids:
-                errors.append(f"{show_id}: Unknown presenter '{presenter_id}'")
+        if not presenter_ids.issuperset(duo):
+            errors.extend(ERR_UNKNOWN_PRESENTER.format(show_id=show_id, presenter_id=presenter_id)
+                          for presenter_id in duo if presenter_id not in presenter_ids)
         
         # Validate topic tags
         primary_tags = show['topics']['primary_tags']
-        for tag in primary_tags:
-            if tag not in allowed_tags:
-                errors.append(f"{show_id}: Unknown tag '{tag}'")
+        if not allowed_tags.issuperset(primary_tags):
+            errors.extend(ERR_UNKNOWN_TAG.format(show_id=show_id, tag=tag)
+                          for tag in primary_tags if tag not in allowed_tags)
     
-    if not errors:
-        print("✓ All cross-references valid")
+    music_fraction = ratios['music_fraction']
+    talk_fraction = ratios['talk_fraction']
     
-    return errors
-
-
-def validate_music_ratios():
-    """Validate music/talk ratios meet station requirements."""
-    print("\n=== Music Ratio Validation ===")
-    errors = []
-    
-    station = load_json('config/station.json')
-    if not station:
-        return ["Failed to load station.json"]
-    
-    max_music = station['default_ratios']['max_music_fraction']
-    min_talk = station['default_ratios']['min_talk_fraction']
-    
-    show_files = sorted(Path('config/shows').glob('*.json'))
-    for show_file in show_files:
-        show = load_json(show_file)
-        if not show:
-            continue
-        
-        show_id = show['id']
-        music_fraction = show['ratios']['music_fraction']
-        talk_fraction = show['ratios']['talk_fraction']
-        
+    # Validate music/talk ratios against station requirements
+    if max_music is not None and min_talk is not None:
         # Check maximum music requirement (music capped at 60%)
         if music_fraction > max_music:
-            errors.append(f"{show_id}: Music {music_fraction} exceeds maximum {max_music}")
+            errors.append(ERR_MUSIC_ABOVE_MAX.format(
+                show_id=show_id, music_fraction=music_fraction, max_music=max_music))
         
         # Check minimum talk requirement (at least 40% talk)
         if talk_fraction < min_talk:
-            errors.append(f"{show_id}: Talk {talk_fraction} below minimum {min_talk}")
+            errors.append(ERR_TALK_BELOW_MIN.format(
+                show_id=show_id, talk_fraction=talk_fraction, min_talk=min_talk))
         
         # Check ratios sum to 1.0
         total = music_fraction + talk_fraction
-        if abs(total - 1.0) > 0.001:
-            errors.append(f"{show_id}: Ratios sum to {total}, not 1.0")
-        
-        print(f"✓ {show_id}: {music_fraction:.0%} music, {talk_fraction:.0%} talk")
+        if abs(total - 1.0) > RATIO_SUM_TOLERANCE:
+            errors.append(ERR_RATIO_SUM.format(show_id=show_id, total=total))
     
-    return errors
+    # Parse HH:MM schedule times for the coverage check
+    start = schedule['start_time_utc']
+    end = schedule['end_time_utc']
+    start_min = HM_TO_MIN.get(start)
+    end_min = 24 * 60 if end in MIDNIGHT_END_TIMES else HM_TO_MIN.get(end)
+    
+    if start_min is None:
+        errors.append(ERR_INVALID_TIME.format(show_id=show_id, which='start', value=start))
+    if end_min is None:
+        errors.append(ERR_INVALID_TIME.format(show_id=show_id, which='end', value=end))
+    
+    schedule_entry = None
+    if start_min is not None and end_min is not None:
+        schedule_entry = {'id': show_id, 'start': start_min, 'end': end_min}
+    
+    # Check AI budgets are reasonable for the show's length and ratios
+    tts_budget = budget['max_tts_seconds_per_show']
+    music_budget = budget['max_music_minutes_per_show']
+    
+    total_seconds = schedule['duration_hours'] * 3600
+    expected_tts = total_seconds * talk_fraction
+    expected_music_mins = (total_seconds * music_fraction) / 60
+    
+    if abs(tts_budget - expected_tts) > TTS_BUDGET_TOLERANCE_SECONDS:
+        warnings.append(WARN_TTS_BUDGET.format(
+            show_id=show_id, tts_budget=tts_budget, expected_tts=expected_tts))
+    
+    if abs(music_budget - expected_music_mins) > MUSIC_BUDGET_TOLERANCE_MINUTES:
+        warnings.append(WARN_MUSIC_BUDGET.format(
+            show_id=show_id, music_budget=music_budget, expected_music_mins=expected_music_mins))
+    
+    if VERBOSE:
+        mark = "✗" if errors else "✓"
+        print(f"{mark} {show_id}: {music_fraction:.0%} music, {talk_fraction:.0%} talk, "
+              f"TTS {tts_budget}s, Music {music_budget}min")
+    
+    return errors, warnings, schedule_entry
 
 
-def validate_schedule_coverage():
-    """Validate that shows cover the full 24-hour period."""
-    print("\n=== Schedule Coverage Validation ===")
+def validate_shows(shows):
+    """Validate cross-references, ratios and AI budgets for every show.
+
+    Takes the parsed show configs and returns (errors, warnings, schedule)
+    where schedule holds one entry per show, kept sorted by start time
+    for validate_schedule_coverage.
+    """
+    print("\n=== Show Validation ===")
     errors = []
+    warnings = []
+    schedule = []
     
-    show_files = sorted(Path('config/shows').glob('*.json'))
-    shows = []
+    # Load configuration files; each check below only needs its own
+    # inputs, so a missing base file skips just the checks that use it
+    presenter_ids = load_presenter_ids()
+    allowed_tags = load_allowed_tags()
     
-    for show_file in show_files:
-        show = load_json(show_file)
-        if not show:
-            continue
-        shows.append(show)
+    if presenter_ids is None or allowed_tags is None:
+        errors.append("Failed to load base configuration files")
+    else:
+        print(f"Found {len(presenter_ids)} presenters")
+        print(f"Found {len(allowed_tags)} allowed topic tags")
     
-    # Parse schedule times
-    schedule = []
-    for show in shows:
-        show_id = show['id']
-        start = show['schedule']['start_time_utc']
-        end = show['schedule']['end_time_utc']
-        
-        # Parse HH:MM format
-        start_hour, start_min = map(int, start.split(':'))
-        end_hour, end_min = map(int, end.split(':'))
-        
-        schedule.append({
-            'id': show_id,
-            'start': start_hour * 60 + start_min,
-            'end': end_hour * 60 + end_min if end != "00:00" else 24 * 60
-        })
-    
-    # Sort by start time
-    schedule.sort(key=lambda x: x['start'])
-    
-    # Check for gaps and overlaps
-    for i in range(len(schedule)):
-        current = schedule[i]
-        next_show = schedule[(i + 1) % len(schedule)]
-        
-        expected_end = next_show['start'] if i < len(schedule) - 1 else 24 * 60
-        
-        if current['end'] < expected_end:
-            gap = expected_end - current['end']
-            errors.append(f"Gap of {gap} minutes between {current['id']} and {next_show['id']}")
-        elif current['end'] > expected_end:
-            overlap = current['end'] - expected_end
-            errors.append(f"Overlap of {overlap} minutes between {current['id']} and {next_show['id']}")
-    
-    # Verify 24-hour coverage
-    total_minutes = sum(s['end'] - s['start'] for s in schedule)
-    if total_minutes != 24 * 60:
-        errors.append(f"Total coverage is {total_minutes/60:.1f} hours, not 24")
+    # Station limits are the same for every show, so look them up once
+    station = load_json('config/station.json')
+    if station:
+        max_music = station['default_ratios']['max_music_fraction']
+        min_talk = station['default_ratios']['min_talk_fraction']
     else:
-        print(f"✓ All 8 shows cover 24 hours")
+        errors.append("Failed to load station.json")
+        max_music = min_talk = None
     
-    for show in schedule:
-        duration = (show['end'] - show['start']) / 60
-        print(f"  {show['id']}: {show['start']//60:02d}:{show['start']%60:02d} - {show['end']//60:02d}:{show['end']%60:02d} ({duration:.1f}h)")
+    # Check each show
+    for show in shows:
+        show_errors, show_warnings, schedule_entry = validate_show(
+            show, presenter_ids, allowed_tags, max_music, min_talk
+        )
+        errors.extend(show_errors)
+        warnings.extend(show_warnings)
+        if schedule_entry is not None:
+            # insort's key= argument needs Python 3.10+
+            bisect.insort(schedule, schedule_entry, key=lambda x: x['start'])
     
-    return errors
+    if not errors:
+        print(f"✓ All {len(shows)} shows valid")
+    
+    return errors, warnings, schedule
 
 
-def validate_ai_budgets():
-    """Validate AI budget allocations align with show parameters."""
-    print("\n=== AI Budget Validation ===")
-    warnings = []
+def validate_schedule_coverage(schedule):
+    """Validate that shows cover the full 24-hour period.
+
+    Expects schedule entries sorted by start time, as built by
+    validate_shows.
+    """
+    print("\n=== Schedule Coverage Validation ===")
+    errors = []
     
-    show_files = sorted(Path('config/shows').glob('*.json'))
-    for show_file in show_files:
-        show = load_json(show_file)
-        if not show:
-            continue
-        
-        show_id = show['id']
-        duration_hours = show['schedule']['duration_hours']
-        talk_fraction = show['ratios']['talk_fraction']
-        music_fraction = show['ratios']['music_fraction']
-        
-        budget = show['ai_budget']
-        tts_budget = budget['max_tts_seconds_per_show']
-        music_budget = budget['max_music_minutes_per_show']
-        
-        # Calculate expected budgets
-        total_seconds = duration_hours * 3600
-        expected_tts = total_seconds * talk_fraction
-        expected_music_mins = (total_seconds * music_fraction) / 60
-        
-        # Check if budgets are reasonable
-        if abs(tts_budget - expected_tts) > 60:
-            warnings.append(f"{show_id}: TTS budget {tts_budget}s differs from expected {expected_tts:.0f}s")
-        
-        if abs(music_budget - expected_music_mins) > 5:
-            warnings.append(f"{show_id}: Music budget {music_budget}min differs from expected {expected_music_mins:.0f}min")
-        
-        print(f"✓ {show_id}: TTS {tts_budget}s, Music {music_budget}min")
+    # Each show should end where the next one starts; the last show
+    # should end at midnight, where the first one picks up again
+    boundaries = [(current, next_show, next_show['start'])
+                  for current, next_show in zip(schedule, schedule[1:])]
+    if schedule:
+        boundaries.append((schedule[-1], schedule[0], 24 * 60))
+    
+    # Check for gaps and overlaps, totalling coverage in the same sweep
+    # since every show is the current one at exactly one boundary
+    total_minutes = 0
+    for current, next_show, expected_end in boundaries:
+        total_minutes += current['end'] - current['start']
+        gap = expected_end - current['end']
+        if gap > 0:
+            errors.append(ERR_SCHEDULE_GAP.format(
+                minutes=gap, current=current['id'], next_show=next_show['id']))
+        elif gap < 0:
+            errors.append(ERR_SCHEDULE_OVERLAP.format(
+                minutes=-gap, current=current['id'], next_show=next_show['id']))
+    
+    # Verify 24-hour coverage; a matching total alone is not enough, as
+    # a gap and an overlap of the same length cancel out
+    if total_minutes != 24 * 60:
+        errors.append(f"Total coverage is {total_minutes/60:.1f} hours, not 24")
+    elif not errors:
+        print(f"✓ All {len(schedule)} shows cover 24 hours")
     
-    return warnings
+    if VERBOSE:
+        for show in schedule:
+            duration = (show['end'] - show['start']) / 60
+            print(f"  {show['id']}: {format_minutes(show['start'])} - {format_minutes(show['end'])} ({duration:.1f}h)")
+    
+    return errors
 
 
 def main():
     """Run all validation checks."""
+    global VERBOSE
+    
+    parser = argparse.ArgumentParser(description="Validate Lofield FM configuration files.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="list every file, show and schedule slot as it is checked")
+    VERBOSE = parser.parse_args().verbose
+    
     print("Lofield FM Configuration Validator\n")
     
     all_errors = []
     all_warnings = []
     
-    # Run validation checks
-    all_errors.extend(validate_json_syntax())
-    all_errors.extend(validate_cross_references())
-    all_errors.extend(validate_music_ratios())
-    all_errors.extend(validate_schedule_coverage())
-    all_warnings.extend(validate_ai_budgets())
+    # Enumerate show files once and share the list with every check; plain
+    # string paths keep the read_json cache keys cheap to hash
+    show_files = [str(f) for f in sorted(Path('config/shows').glob('*.json'))]
+    
+    # Parse every file up front; the checks below then work from the cache
+    preload_json(BASE_CONFIG_FILES + show_files)
+    
+    # Run validation checks; shows that failed to parse are reported
+    # once by the syntax check and left out of the rest
+    syntax_errors, parsed = validate_json_syntax(show_files)
+    all_errors.extend(syntax_errors)
+    shows = [parsed[f] for f in show_files if f in parsed]
+    show_errors, show_warnings, schedule = validate_shows(shows)
+    all_errors.extend(show_errors)
+    all_warnings.extend(show_warnings)
+    all_errors.extend(validate_schedule_coverage(schedule))
     
     # Print summary
     print("\n" + "=" * 50)
     if all_errors:
         print(f"\n✗ VALIDATION FAILED with {len(all_errors)} error(s):\n")
-        for error in all_errors:
-            print(f"  ✗ {error}")
+        print("\n".join(f"  ✗ {error}" for error in all_errors))
         sys.exit(1)
     elif all_warnings:
         print(f"\n⚠ VALIDATION PASSED with {len(all_warnings)} warning(s):\n")
-        for warning in all_warnings:
-            print(f"  ⚠ {warning}")
+        print("\n".join(f"  ⚠ {warning}" for warning in all_warnings))
     else:
         print("\n✓ ALL VALIDATION CHECKS PASSED!")
     